@@ -45,13 +45,13 @@ def unlink_displacement(material: bpy.types.Material) -> None:
     material_output_nodes = _get_top_level_material_outputs(material.node_tree)
 
     for material_output_node in material_output_nodes:
-        # Find links connected to the material output node "Displacement" socket and unlink them
-        for link in material.node_tree.links:
-            if link.to_node != material_output_node:
-                continue
-            if link.to_socket.name != "Displacement":
-                continue
+        # Find links connected to the material output node "Displacement" socket and unlink them,
+        # the socket's links are collected in C, avoiding a Python-level loop over all tree links.
+        displacement_socket = material_output_node.inputs.get("Displacement", None)
+        if displacement_socket is None:
+            continue
 
+        for link in displacement_socket.links:
             material.node_tree.links.remove(link)
             break
 
@@ -119,6 +119,24 @@ class MaterialSpawnedData(SpawnedData):
         super().__init__({material})
 
 
+def _assign_material_to_objects(
+    material: bpy.types.Material, objects: typing.Iterable[bpy.types.Object]
+) -> None:
+    """Assigns 'material' to the active material slot of all 'objects' that can have materials
+
+    Objects without any material slots get the material appended.
+    """
+    for obj in objects:
+        # All of the assignable object types have material_slots, so checking the type is enough
+        # here, this loop can run over large selections.
+        if obj.type not in utils.MATERIAL_ASSIGNABLE_OBJECT_TYPES:
+            continue
+        if len(obj.material_slots) < 1:
+            obj.data.materials.append(material)
+        else:
+            obj.material_slots[obj.active_material_index].material = material
+
+
 def spawn_material(
     path: str, context: bpy.types.Context, options: MaterialSpawnOptions
 ) -> MaterialSpawnedData:
@@ -130,14 +148,7 @@ def spawn_material(
     Returns the spawned material.
     """
     material = load.load_material(path)
-    for obj in options.target_objects:
-        if not utils.can_have_materials_assigned(obj):
-            continue
-        if len(obj.material_slots) < 1:
-            obj.data.materials.append(material)
-        else:
-            obj.material_slots[obj.active_material_index].material = material
-
+    _assign_material_to_objects(material, options.target_objects)
     textures.change_texture_sizes(options.texture_size, textures.get_used_textures(material))
 
     if displacement.can_link_displacement(material):
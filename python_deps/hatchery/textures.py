@@ -19,17 +19,24 @@ def generate_filepath(texture_path: str, basename: str, max_size: str, ext: str)
 
 
 def is_materialiq_texture(image: bpy.types.Image) -> bool:
-    basename, _ = os.path.splitext(os.path.basename(image.filepath))
-    if basename.startswith("mq_") and basename.split("_")[-1].isdigit():
-        return True
+    filename = os.path.basename(image.filepath)
+    # Reject non-materialiq images before doing any more string processing, most of the images
+    # in a non-materialiq scene end here.
+    if not filename.startswith("mq_"):
+        return False
 
-    return False
+    basename, _ = os.path.splitext(filename)
+    return basename.split("_")[-1].isdigit()
 
 
 def change_texture_size(max_size: int, image: bpy.types.Image):
     if not is_materialiq_texture(image):
         return
 
+    _change_materialiq_texture_size(max_size, image)
+
+
+def _change_materialiq_texture_size(max_size: int, image: bpy.types.Image):
     basename, ext = os.path.splitext(os.path.basename(image.filepath))
     if ext not in TEXTURE_EXTENSIONS:
         return
@@ -65,8 +72,11 @@ def change_texture_sizes(
         for image in only_textures:
             change_texture_size(max_size, image)
     else:
-        for image in bpy.data.images:
-            change_texture_size(max_size, image)
+        # Snapshot of the materialiq images, changing the size renames them, which reorders
+        # 'bpy.data.images'
+        mq_images = [image for image in bpy.data.images if is_materialiq_texture(image)]
+        for image in mq_images:
+            _change_materialiq_texture_size(max_size, image)
 
 
 def get_used_textures_in_node(node: bpy.types.Node) -> typing.Set[bpy.types.Image]:
@@ -131,6 +131,20 @@ def calculate_mesh_area(obj: bpy.types.Object, include_weight: bool = False) ->
     return mesh_area
 
 
+# Object types that have material_slots and can have materials assigned
+MATERIAL_ASSIGNABLE_OBJECT_TYPES = frozenset(
+    {
+        'MESH',
+        'CURVE',
+        'SURFACE',
+        'META',
+        'FONT',
+        'GPENCIL',
+        'VOLUME',
+    }
+)
+
+
 def can_have_materials_assigned(obj: bpy.types.Object) -> bool:
     """Checks whether given object can have materials assigned
 
@@ -139,12 +153,4 @@ def can_have_materials_assigned(obj: bpy.types.Object) -> bool:
 
     # In theory checking the availability of material_slots is not necessary, all these
     # object types should have it. We check for it to avoid exceptions and errors in our code.
-    return obj.type in {
-        'MESH',
-        'CURVE',
-        'SURFACE',
-        'META',
-        'FONT',
-        'GPENCIL',
-        'VOLUME',
-    } and hasattr(obj, "material_slots")
+    return obj.type in MATERIAL_ASSIGNABLE_OBJECT_TYPES and hasattr(obj, "material_slots")
@@ -757,13 +757,15 @@ def append_modifiers_from_library(
 
     It doesn't copy complex and readonly properties, e.g. properties that are driven by FCurve.
     """
-    if modifier_container_name not in bpy.data.objects:
+    modifier_container = bpy.data.objects.get(modifier_container_name, None)
+    if modifier_container is None:
         with bpy.data.libraries.load(library_path) as (data_from, data_to):
             assert modifier_container_name in data_from.objects
             data_to.objects = [modifier_container_name]
 
-    assert modifier_container_name in bpy.data.objects
-    modifier_container = bpy.data.objects[modifier_container_name]
+        # data_to is populated with the loaded datablocks once the 'with' block exits
+        modifier_container = data_to.objects[0]
+        assert modifier_container is not None
 
     for obj in target_objs:
         for src_modifier in modifier_container.modifiers:
@@ -96,15 +96,46 @@ def get_material_slots_used_by_text(obj: bpy.types.Object) -> typing.FrozenSet[i
     if not hasattr(obj.data, "body_format"):
         return frozenset()
 
-    seen_indices = set()
-    for character in obj.data.body_format:
-        seen_indices.add(character.material_index)
+    material_indices = numpy.zeros(len(obj.data.body_format), dtype=numpy.int32)
+    obj.data.body_format.foreach_get('material_index', material_indices)
+    unique_indices = numpy.unique(material_indices)
+    return frozenset(unique_indices)
 
-    return frozenset(seen_indices)
 
+def get_materials_used_by_node_group(
+    node_group: bpy.types.NodeTree,
+) -> typing.FrozenSet[bpy.types.Material]:
+    """Returns a FrozenSet[Material] used by nodes of a given geometry nodes 'node_group'.
 
-def get_materials_used_by_geonodes(obj: bpy.types.Object) -> typing.FrozenSet[bpy.types.Material]:
-    """Returns a FrozenSet[Material] used by a given Object's geometry nodes modifiers."""
+    Materials assigned through the modifier inputs are not included, those are per modifier.
+    """
+    used_materials = set()
+    for node in node_utils_bpy.find_nodes_in_tree(node_group):
+        for node_input in node.inputs:
+            if node_input.type != 'MATERIAL':
+                continue
+            if node_input.default_value is not None:
+                used_materials.add(node_input.default_value)
+        if hasattr(node, 'material'):
+            if node.material is not None:
+                used_materials.add(node.material)
+
+    return frozenset(used_materials)
+
+
+def get_materials_used_by_geonodes(
+    obj: bpy.types.Object,
+    node_group_materials: typing.Optional[
+        typing.Dict[bpy.types.NodeTree, typing.FrozenSet[bpy.types.Material]]
+    ] = None,
+) -> typing.FrozenSet[bpy.types.Material]:
+    """Returns a FrozenSet[Material] used by a given Object's geometry nodes modifiers.
+
+    Pass the same (initially empty) node_group_materials dict if this function is used in a loop
+    for performance reasons. Node groups shared by multiple modifiers are then scanned only once.
+    """
+    if node_group_materials is None:
+        node_group_materials = {}
 
     used_materials = set()
     for mod in obj.modifiers:
@@ -121,12 +152,11 @@ def get_materials_used_by_geonodes(obj: bpy.types.Object) -> typing.FrozenSet[bp
                 if mat is not None:
                     used_materials.add(mat)
 
-        for node in node_utils_bpy.find_nodes_in_tree(mod.node_group):
-            for node_input in filter(lambda i: i.type == 'MATERIAL', node.inputs):
-                if node_input.default_value is not None:
-                    used_materials.add(node_input.default_value)
-            if hasattr(node, 'material'):
-                if node.material is not None:
-                    used_materials.add(node.material)
+        node_group_mats = node_group_materials.get(mod.node_group, None)
+        if node_group_mats is None:
+            node_group_mats = get_materials_used_by_node_group(mod.node_group)
+            node_group_materials[mod.node_group] = node_group_mats
+
+        used_materials |= node_group_mats
 
     return frozenset(used_materials)
@@ -2,9 +2,9 @@
 
 import bpy
 import typing
-import itertools
 import collections
 import dataclasses
+import functools
 
 if "utils_bpy" not in locals():
     from . import utils_bpy
@@ -14,6 +14,35 @@ else:
     utils_bpy = importlib.reload(utils_bpy)
 
 
+@functools.lru_cache(maxsize=8192)
+def _strip_suffix(name: str) -> str:
+    """Cached 'utils_bpy.remove_object_duplicate_suffix', node names repeat a lot between scans"""
+    return utils_bpy.remove_object_duplicate_suffix(name)
+
+
+T = typing.TypeVar("T")
+
+
+def _walk_unique(
+    roots: typing.Iterable[T], get_children: typing.Callable[[T], typing.Iterable[T]]
+) -> typing.Iterator[T]:
+    """Yields all items reachable from 'roots' breadth first, each item only once
+
+    Items have to be hashable, bpy structs hash by their pointer, so they can be used directly.
+    Children of an item are requested only after the item was yielded, stopping the iteration
+    stops the traversal.
+    """
+    visited = set()
+    queue = collections.deque(roots)
+    while len(queue) > 0:
+        item = queue.popleft()
+        if item in visited:
+            continue
+        visited.add(item)
+        yield item
+        queue.extend(get_children(item))
+
+
 # Type that's compatible with both old and new node tree interfaces
 if bpy.app.version < (4, 0, 0):
     NodeSocketInterfaceCompat = bpy.types.NodeSocketInterfaceStandard
@@ -82,31 +111,54 @@ def get_socket_type(socket: NodeSocketInterfaceCompat) -> str:
         return new_value
 
 
-def find_nodes_in_tree(
+def iter_nodes_in_tree(
     node_tree: typing.Optional[bpy.types.NodeTree],
     filter_: typing.Optional[typing.Callable[[bpy.types.Node], bool]] = None,
     local_only: bool = False,
-) -> typing.Set[bpy.types.Node]:
-    """Returns a set of nodes from a given node tree that comply with the filter"""
-    ret = set()
+) -> typing.Iterator[bpy.types.Node]:
+    """Yields nodes from a given node tree and its nested node trees that comply with the filter
+
+    Nested node groups are traversed iteratively and each node tree is visited only once, even if
+    it is instanced multiple times. Prefer this over 'find_nodes_in_tree' if only the first match
+    is needed, the traversal stops as soon as the caller stops iterating.
+    """
     if node_tree is None:
-        return ret
-    for node in node_tree.nodes:
-        if getattr(node, "node_tree", None) is not None:
-            if node.node_tree.library is None or not local_only:
-                ret.update(find_nodes_in_tree(node.node_tree, filter_, local_only))
+        return
 
-        if filter_ is not None and not filter_(node):
-            continue
+    # bpy structs hash and compare by their underlying pointer, so the node trees themselves
+    # are used as keys, id() of the Python wrappers isn't stable between accesses.
+    seen = {node_tree}
+    stack = [node_tree]
+    while len(stack) > 0:
+        current_tree = stack.pop()
+        for node in current_tree.nodes:
+            nested_tree = getattr(node, "node_tree", None)
+            if nested_tree is not None and nested_tree not in seen:
+                if nested_tree.library is None or not local_only:
+                    seen.add(nested_tree)
+                    stack.append(nested_tree)
+
+            if filter_ is not None and not filter_(node):
+                continue
 
-        ret.add(node)
+            yield node
 
-    return ret
+
+def find_nodes_in_tree(
+    node_tree: typing.Optional[bpy.types.NodeTree],
+    filter_: typing.Optional[typing.Callable[[bpy.types.Node], bool]] = None,
+    local_only: bool = False,
+) -> typing.Set[bpy.types.Node]:
+    """Returns a set of nodes from a given node tree that comply with the filter
+
+    See 'iter_nodes_in_tree' for details on the traversal.
+    """
+    return set(iter_nodes_in_tree(node_tree, filter_, local_only))
 
 
 def get_top_level_material_nodes_with_name(
     obj: bpy.types.Object,
-    node_names: typing.Set[str],
+    node_names: typing.AbstractSet[str],
 ) -> typing.Iterable[bpy.types.Node]:
     """Searches for top level nodes or node groups = not nodes nested in other node groups.
 
@@ -123,29 +175,42 @@ def get_top_level_material_nodes_with_name(
         if material_slot.material.node_tree is None:
             continue  # material is not using nodes or the node_tree is invalid
         for node in material_slot.material.node_tree.nodes:
-            if node.type == 'GROUP':
-                if utils_bpy.remove_object_duplicate_suffix(node.node_tree.name) in node_names:
-                    yield node
-            else:
-                if utils_bpy.remove_object_duplicate_suffix(node.name) in node_names:
-                    yield node
+            name = node.node_tree.name if node.type == 'GROUP' else node.name
+            if _strip_suffix(name) in node_names:
+                yield node
 
 
 def find_nodes_by_bl_idname(
     nodes: typing.Iterable[bpy.types.Node], bl_idname: str, recursive: bool = False
 ) -> typing.Iterable[bpy.types.Node]:
-    for node in nodes:
+    """Yields nodes from 'nodes' with given 'bl_idname'
+
+    If 'recursive' is True, nodes of nested node groups are searched too, each node tree only once.
+    """
+    seen = set()
+    # Stack of node iterators, so nested nodes are yielded right after their group node
+    stack = [iter(nodes)]
+    while len(stack) > 0:
+        node = next(stack[-1], None)
+        if node is None:
+            stack.pop()
+            continue
+
         if node.bl_idname == bl_idname:
             yield node
-        if recursive and node.node_tree is not None:
-            yield from find_nodes_by_bl_idname(node.node_tree.nodes, bl_idname)
+
+        if not recursive:
+            continue
+
+        nested_tree = getattr(node, "node_tree", None)
+        if nested_tree is not None and nested_tree not in seen:
+            seen.add(nested_tree)
+            stack.append(iter(nested_tree.nodes))
 
 
 def find_nodes_by_name(node_tree: bpy.types.NodeTree, name: str) -> typing.Set[bpy.types.Node]:
     """Returns set of nodes from 'node_tree' which name without duplicate suffix is 'name'"""
-    nodes = find_nodes_in_tree(
-        node_tree, lambda x: utils_bpy.remove_object_duplicate_suffix(x.name) == name
-    )
+    nodes = find_nodes_in_tree(node_tree, lambda x: _strip_suffix(x.name) == name)
     return nodes
 
 
@@ -167,7 +232,7 @@ def find_nodegroups_by_name(
             return False
 
         name_for_comparing = node.node_tree.name if use_node_tree_name else node.name
-        return utils_bpy.remove_object_duplicate_suffix(name_for_comparing) == name
+        return _strip_suffix(name_for_comparing) == name
 
     nodes = find_nodes_in_tree(node_tree, nodegroup_filter)
     return nodes
@@ -183,8 +248,50 @@ def find_incoming_nodes(node: bpy.types.Node) -> typing.Set[bpy.types.Node]:
     return ret
 
 
-def find_link_connected_to(
+NodeSocketKey = typing.Tuple[bpy.types.Node, str]
+
+
+@dataclasses.dataclass
+class NodeLinkIndex:
+    """Links of a node tree indexed by (node, socket name) on both of their ends
+
+    Build it once using 'build_link_index' and pass it instead of 'links' to the 'find_link*'
+    functions when doing multiple queries on the same node tree.
+    """
+
+    to_: typing.Dict[NodeSocketKey, typing.List[bpy.types.NodeLink]]
+    from_: typing.Dict[NodeSocketKey, typing.List[bpy.types.NodeLink]]
+
+
+def build_link_index(links: typing.Iterable[bpy.types.NodeLink]) -> NodeLinkIndex:
+    """Walks 'links' once and indexes them by their target and origin node and socket name"""
+    to_: typing.DefaultDict[NodeSocketKey, typing.List[bpy.types.NodeLink]] = (
+        collections.defaultdict(list)
+    )
+    from_: typing.DefaultDict[NodeSocketKey, typing.List[bpy.types.NodeLink]] = (
+        collections.defaultdict(list)
+    )
+    for link in links:
+        to_[(link.to_node, link.to_socket.name)].append(link)
+        from_[(link.from_node, link.from_socket.name)].append(link)
+
+    return NodeLinkIndex(dict(to_), dict(from_))
+
+
+def _index_links_by_origin(
     links: typing.Iterable[bpy.types.NodeLink],
+) -> typing.Dict[NodeSocketKey, typing.List[bpy.types.NodeLink]]:
+    from_: typing.DefaultDict[NodeSocketKey, typing.List[bpy.types.NodeLink]] = (
+        collections.defaultdict(list)
+    )
+    for link in links:
+        from_[(link.from_node, link.from_socket.name)].append(link)
+
+    return dict(from_)
+
+
+def find_link_connected_to(
+    links: typing.Iterable[bpy.types.NodeLink] | NodeLinkIndex,
     to_node: bpy.types.Node,
     to_socket_name: str,
     skip_reroutes: bool = False,
@@ -195,8 +302,13 @@ def find_link_connected_to(
     to a socket. It is allowed to connect multiple links *from* one socket, but not *to* one socket.
     """
 
+    if isinstance(links, NodeLinkIndex):
+        candidates = links.to_.get((to_node, to_socket_name), [])
+    else:
+        candidates = links
+
     ret: typing.List[bpy.types.NodeLink] = []
-    for link in links:
+    for link in candidates:
         if to_node != link.to_node:
             continue
         if to_socket_name != link.to_socket.name:
@@ -217,12 +329,18 @@ def find_link_connected_to(
 
 
 def find_links_connected_from(
-    links: typing.Iterable[bpy.types.NodeLink], from_node: bpy.types.Node, from_socket_name: str
+    links: typing.Iterable[bpy.types.NodeLink] | NodeLinkIndex,
+    from_node: bpy.types.Node,
+    from_socket_name: str,
 ) -> typing.Iterable[bpy.types.NodeLink]:
     """Find links connected from given node (from_node) from given socket name (from_socket_name)
 
     There can be any number of such links.
     """
+    if isinstance(links, NodeLinkIndex):
+        yield from links.from_.get((from_node, from_socket_name), [])
+        return
+
     for link in links:
         if from_node != link.from_node:
             continue
@@ -233,21 +351,35 @@ def find_links_connected_from(
 
 
 def is_node_socket_connected_to(
-    links: typing.Iterable[bpy.types.NodeLink],
+    links: typing.Iterable[bpy.types.NodeLink] | NodeLinkIndex,
     from_node: bpy.types.Node,
     from_socket_name: str,
     to_nodes: typing.List[bpy.types.Node],
     to_socket_name: typing.Optional[str],
     recursive: bool = True,
 ) -> bool:
-    for link in find_links_connected_from(links, from_node, from_socket_name):
-        if link.to_node in to_nodes and (
+    def is_target(link: bpy.types.NodeLink) -> bool:
+        return link.to_node in to_nodes and (
             to_socket_name is None or to_socket_name == link.to_socket.name
-        ):
-            return True
-        if recursive and is_node_socket_connected_to(
-            links, link.to_node, link.to_socket.name, to_nodes, to_socket_name, True
-        ):
+        )
+
+    if not recursive:
+        return any(
+            is_target(link)
+            for link in find_links_connected_from(links, from_node, from_socket_name)
+        )
+
+    if isinstance(links, NodeLinkIndex):
+        links_from = links.from_
+    else:
+        # The recursive search queries links from many sockets, index just the links' origins
+        links_from = _index_links_by_origin(links)
+
+    def get_connected_sockets(key: NodeSocketKey) -> typing.Iterable[NodeSocketKey]:
+        return [(link.to_node, link.to_socket.name) for link in links_from.get(key, [])]
+
+    for key in _walk_unique([(from_node, from_socket_name)], get_connected_sockets):
+        if any(is_target(link) for link in links_from.get(key, [])):
             return True
 
     return False
@@ -256,29 +388,23 @@ def is_node_socket_connected_to(
 def get_node_input_socket(
     node: bpy.types.Node, socket_name: str
 ) -> typing.Optional[bpy.types.NodeSocket]:
-    ret = None
-    for input_ in node.inputs:
-        if input_.name != socket_name:
-            continue
-        if ret is not None:
-            raise RuntimeError("Multiple matches!")
-        ret = input_
+    """Returns input socket of 'node' named 'socket_name' or None if there is no such socket
 
-    return ret
+    Uses the native lookup of the sockets collection. If multiple sockets share the same name
+    (e.g. sockets for different data types in the Mix node) the first one is returned.
+    """
+    return node.inputs.get(socket_name, None)
 
 
 def get_node_output_socket(
     node: bpy.types.Node, socket_name: str
 ) -> typing.Optional[bpy.types.NodeSocket]:
-    ret = None
-    for output in node.outputs:
-        if output.name != socket_name:
-            continue
-        if ret is not None:
-            raise RuntimeError("Multiple matches!")
-        ret = output
+    """Returns output socket of 'node' named 'socket_name' or None if there is no such socket
 
-    return ret
+    Uses the native lookup of the sockets collection. If multiple sockets share the same name
+    the first one is returned.
+    """
+    return node.outputs.get(socket_name, None)
 
 
 def find_nodegroup_users(
@@ -294,20 +420,19 @@ def find_nodegroup_users(
     In case of editable objects this returns the object itself and list with the object in it.
     """
 
+    def is_collection_instancer(obj: bpy.types.Object) -> bool:
+        return (
+            obj.type == 'EMPTY'
+            and obj.instance_type == 'COLLECTION'
+            and obj.instance_collection is not None
+        )
+
     def find_origin_objects(instancer_obj: bpy.types.Object) -> typing.Iterable[bpy.types.Object]:
-        if instancer_obj.type != 'EMPTY':
-            return [instancer_obj]
-
-        objects = {instancer_obj}
-        while len(objects) > 0:
-            obj = objects.pop()
-            if (
-                obj.type == 'EMPTY'
-                and obj.instance_type == 'COLLECTION'
-                and obj.instance_collection is not None
-            ):
-                objects.update(obj.instance_collection.all_objects)
-            else:
+        for obj in _walk_unique(
+            [instancer_obj],
+            lambda x: x.instance_collection.all_objects if is_collection_instancer(x) else [],
+        ):
+            if not is_collection_instancer(obj):
                 yield obj
 
     # Firstly gather all the materials that use the nodegroup with given name
@@ -316,18 +441,28 @@ def find_nodegroup_users(
         if material.node_tree is None:
             continue
 
-        nodes = find_nodes_in_tree(
-            material.node_tree,
-            lambda x: isinstance(x, bpy.types.ShaderNodeGroup)
-            and x.node_tree.name == nodegroup_name,
+        first_nodegroup = next(
+            iter_nodes_in_tree(
+                material.node_tree,
+                lambda x: x.bl_idname == "ShaderNodeGroup"
+                and x.node_tree is not None
+                and x.node_tree.name == nodegroup_name,
+            ),
+            None,
         )
-
-        if len(nodes) > 0:
+        if first_nodegroup is not None:
             materials_using_nodegroup.add(material)
 
     if len(materials_using_nodegroup) == 0:
         return []
 
+    # Multiple empties often instance the same collection, the instanced objects and their
+    # materials are gathered only once per collection.
+    instanced_collection_info: typing.Dict[
+        bpy.types.Collection,
+        typing.Tuple[typing.Set[bpy.types.Object], typing.Set[bpy.types.Material]],
+    ] = {}
+
     # Go through all objects and yield ones that have one of the found materials
     for obj in bpy.data.objects:
         # We skip objects with library here as they will be gathered by 'find_origin_objects'
@@ -341,29 +476,36 @@ def find_nodegroup_users(
             and obj.instance_type == 'COLLECTION'
             and obj.instance_collection is not None
         ):
-            instance_materials = set()
-            instanced_objs = set(itertools.chain(find_origin_objects(obj)))
-            for instanced_obj in instanced_objs:
-                instance_materials.update(
-                    {
-                        slot.material
-                        for slot in instanced_obj.material_slots
-                        if slot.material is not None
-                    }
-                )
-
-            if len(instance_materials.intersection(materials_using_nodegroup)) > 0:
-                yield obj, instanced_objs
+            info = instanced_collection_info.get(obj.instance_collection, None)
+            if info is None:
+                instance_materials = set()
+                instanced_objs = set(find_origin_objects(obj))
+                for instanced_obj in instanced_objs:
+                    instance_materials.update(
+                        {
+                            slot.material
+                            for slot in instanced_obj.material_slots
+                            if slot.material is not None
+                        }
+                    )
+                info = (instanced_objs, instance_materials)
+                instanced_collection_info[obj.instance_collection] = info
+
+            instanced_objs, instance_materials = info
+
+            if not instance_materials.isdisjoint(materials_using_nodegroup):
+                # The set is shared by all instancers of the collection, callers get their own copy
+                yield obj, set(instanced_objs)
 
         else:
             if not hasattr(obj, "material_slots"):
                 continue
 
-            obj_materials = {
+            obj_materials = (
                 slot.material for slot in obj.material_slots if slot.material is not None
-            }
+            )
 
-            if len(obj_materials & materials_using_nodegroup) > 0:
+            if not materials_using_nodegroup.isdisjoint(obj_materials):
                 yield obj, [obj]
 
 
@@ -433,12 +575,10 @@ class NodeSocketsDrawTemplate:
     ) -> None:
         if draw_max_first_occurrences < 1:
             return
-        nodegroups = list(
-            itertools.chain(
-                find_nodes_by_name(mat.node_tree, self.name),
-                find_nodegroups_by_name(mat.node_tree, self.name),
-            )
-        )
+        nodegroups = [
+            *find_nodes_by_name(mat.node_tree, self.name),
+            *find_nodegroups_by_name(mat.node_tree, self.name),
+        ]
 
         if len(nodegroups) == 0:
             layout.label(text=f"No '{self.name}' nodegroup found", icon='INFO')
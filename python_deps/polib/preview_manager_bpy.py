@@ -18,6 +18,9 @@ class PreviewManager:
         self.preview_collection = bpy.utils.previews.new()
         self.lock = threading.Lock()
         self.id_path_map: typing.Dict[str, str] = {}
+        # Paths added by 'add_preview_path' that weren't scanned yet. Scanning is postponed to
+        # the first request of any preview, so adding paths on module import is cheap.
+        self.pending_paths: typing.List[typing.Tuple[str, typing.Optional[str]]] = []
         self.allowed_extensions = {".png", ".jpg"}
 
     def add_preview_path(self, path: str, id_override: typing.Optional[str] = None) -> None:
@@ -30,13 +33,21 @@ class PreviewManager:
 
         The preview is then loaded on demand when requested by its ID using 'get_icon_id'.
         """
-        self._update_path_map_entry(path, id_override)
+        if id_override is not None and os.path.isdir(path):
+            raise RuntimeError("id_override is not allowed for directories!")
+
+        with self.lock:
+            self.pending_paths.append((path, id_override))
 
     def get_icon_id(self, id_: str) -> int:
         """Return icon_id for preview with id 'id_'
 
         Returns question mark icon id if 'id_' is not found.
         """
+        with self.lock:
+            if len(self.pending_paths) > 0:
+                self._process_pending_paths()
+
         if id_ in self.preview_collection:
             return self.preview_collection[id_].icon_id
         else:
@@ -77,16 +88,31 @@ class PreviewManager:
                 if id_ in self.preview_collection:
                     del self.preview_collection[id_]
 
+    def _process_pending_paths(self) -> None:
+        """Scans paths added by 'add_preview_path', expects 'self.lock' to be held by the caller"""
+        pending_paths = self.pending_paths
+        self.pending_paths = []
+        for path, id_override in pending_paths:
+            # This runs from draw callbacks, one unreadable path mustn't prevent scanning the others
+            try:
+                self._update_path_map_entry(path, id_override)
+            except OSError:
+                logger.exception(f"Failed to scan previews in '{path}'")
+
     def _update_path_map_entry(self, path: str, id_override: typing.Optional[str] = None) -> None:
         if os.path.isdir(path):
             if id_override is not None:
                 raise RuntimeError("id_override is not allowed for directories!")
 
-            for file in os.listdir(path):
-                filename, ext = os.path.splitext(file)
-                basename = os.path.basename(filename)
-                if ext.lower() in self.allowed_extensions:
-                    self.id_path_map[basename] = os.path.join(path, file)
+            # scandir gives us the full path and cached file type without additional syscalls
+            with os.scandir(path) as it:
+                for entry in it:
+                    basename, _, ext = entry.name.rpartition(".")
+                    if basename == "" or f".{ext.lower()}" not in self.allowed_extensions:
+                        continue
+                    if not entry.is_file():
+                        continue
+                    self.id_path_map[basename] = entry.path
                     if basename in self.preview_collection:
                         del self.preview_collection[basename]
 
@@ -3,7 +3,6 @@
 
 
 import bpy
-import re
 import os
 import typing
 from . import utils_bpy
@@ -21,9 +20,7 @@ def polygoniq_duplicate_data_filter(
     If 'data_filepaths' argument is provided, images with path common to paths provided are also
     considered duplicates.
     """
-    # Pattern to check if the object contains a duplicate suffix - .001 - .999 after the name
-    pattern = re.compile(r"^\.[0-9]{3}$")
-    if not pattern.match(data.name[-4:]):
+    if not utils_bpy.contains_object_duplicate_suffix(data.name):
         return False
 
     if data_filepaths is None:
@@ -59,13 +56,7 @@ def _is_duplicate_filtered(
     filters: typing.Iterable[DuplicateFilter],
     install_paths: typing.Optional[typing.Set[str]] = None,
 ) -> bool:
-    filtered = False
-    for filter_ in filters:
-        if not filter_(data, install_paths):
-            filtered = True
-            break
-
-    return filtered
+    return not all(filter_(data, install_paths) for filter_ in filters)
 
 
 def remove_duplicate_datablocks(
@@ -73,24 +64,36 @@ def remove_duplicate_datablocks(
     filters: typing.Optional[typing.Iterable[DuplicateFilter]] = None,
     install_paths: typing.Optional[typing.Set[str]] = None,
 ) -> typing.List[str]:
-    to_remove = []
-
+    # Look up original datablocks by name in a Python dict, each lookup in bpy_prop_collection
+    # goes through the RNA. Names are unique only within one library, so the first datablock with
+    # given name wins, same as with 'datablocks[name]'. The map is kept up to date when datablocks
+    # are renamed.
+    name_map: typing.Dict[str, bpy.types.ID] = {}
     for datablock in datablocks:
+        name_map.setdefault(datablock.name, datablock)
+    if filters is not None:
+        # 'filters' is iterated for each datablock, it can't be a one-shot iterator
+        filters = tuple(filters)
+    to_remove: typing.List[typing.Tuple[str, bpy.types.ID]] = []
+
+    for datablock in list(datablocks):
+        name = datablock.name
         if filters is not None and _is_duplicate_filtered(datablock, filters, install_paths):
             continue
 
         # ok, so it's a duplicate, let's figure out the "proper" datablock
-        orig_datablock_name = utils_bpy.remove_object_duplicate_suffix(datablock.name)
-        if orig_datablock_name in datablocks:
-            orig_node_group = datablocks[orig_datablock_name]
-            datablock.user_remap(orig_node_group)
+        orig_datablock_name = utils_bpy.remove_object_duplicate_suffix(name)
+        orig_datablock = name_map.get(orig_datablock_name, None)
+        if orig_datablock is not None:
+            datablock.user_remap(orig_datablock)
             if datablock.users == 0:
-                to_remove.append(datablock)
+                to_remove.append((name, datablock))
         else:
             # the original datablock is gone, we should rename this one
             datablock.name = orig_datablock_name
+            name_map.setdefault(datablock.name, datablock)
     ret = []
-    for datablock in to_remove:
-        ret.append(datablock.name)
+    for name, datablock in to_remove:
+        ret.append(name)
         datablocks.remove(datablock)
     return ret
@@ -48,42 +48,24 @@ def get_asset_pack_icon_parameters(
         return {"icon": bpy_icon_name}
 
 
+# (text, icon id, url) of buttons drawn by 'draw_social_media_buttons'
+SOCIAL_MEDIA_BUTTONS = (
+    ("Discord", "logo_discord", SocialMediaURL.DISCORD),
+    ("Facebook", "logo_facebook", SocialMediaURL.FACEBOOK),
+    ("Instagram", "logo_instagram", SocialMediaURL.INSTAGRAM),
+    ("BlenderMarket", "logo_blendermarket", SocialMediaURL.BLENDERMARKET),
+    ("Gumroad", "logo_gumroad", SocialMediaURL.GUMROAD),
+    ("Website", "logo_polygoniq", SocialMediaURL.WEBPAGE),
+)
+
+
 def draw_social_media_buttons(layout: bpy.types.UILayout, show_text: bool = False):
-    layout.operator(
-        "wm.url_open",
-        text="Discord" if show_text else "",
-        icon_value=icon_manager.get_icon_id("logo_discord"),
-    ).url = SocialMediaURL.DISCORD
-
-    layout.operator(
-        "wm.url_open",
-        text="Facebook" if show_text else "",
-        icon_value=icon_manager.get_icon_id("logo_facebook"),
-    ).url = SocialMediaURL.FACEBOOK
-
-    layout.operator(
-        "wm.url_open",
-        text="Instagram" if show_text else "",
-        icon_value=icon_manager.get_icon_id("logo_instagram"),
-    ).url = SocialMediaURL.INSTAGRAM
-
-    layout.operator(
-        "wm.url_open",
-        text="BlenderMarket" if show_text else "",
-        icon_value=icon_manager.get_icon_id("logo_blendermarket"),
-    ).url = SocialMediaURL.BLENDERMARKET
-
-    layout.operator(
-        "wm.url_open",
-        text="Gumroad" if show_text else "",
-        icon_value=icon_manager.get_icon_id("logo_gumroad"),
-    ).url = SocialMediaURL.GUMROAD
-
-    layout.operator(
-        "wm.url_open",
-        text="Website" if show_text else "",
-        icon_value=icon_manager.get_icon_id("logo_polygoniq"),
-    ).url = SocialMediaURL.WEBPAGE
+    for text, icon_id, url in SOCIAL_MEDIA_BUTTONS:
+        layout.operator(
+            "wm.url_open",
+            text=text if show_text else "",
+            icon_value=icon_manager.get_icon_id(icon_id),
+        ).url = url
 
 
 def draw_settings_footer(layout: bpy.types.UILayout):
@@ -96,7 +78,8 @@ def draw_settings_footer(layout: bpy.types.UILayout):
 
 
 def show_message_box(message: str, title: str, icon: str = 'INFO') -> None:
-    lines = message.split("\n")
+    # Empty lines, e.g. from a trailing newline, would only create empty rows in the popup
+    lines = [line for line in message.split("\n") if line]
 
     def draw(self, context):
         for line in lines:
@@ -110,15 +93,17 @@ def multi_column(
     layout: bpy.types.UILayout, column_sizes: typing.List[float], align: bool = False
 ) -> typing.List[bpy.types.UILayout]:
     columns = []
-    for i in range(len(column_sizes)):
+    consumed = 0.0
+    for column_size in column_sizes:
         # save first column, create split from the other with recalculated size
-        size = 1.0 - sum(column_sizes[:i]) if i > 0 else 1.0
+        size = 1.0 - consumed
 
-        s = layout.split(factor=column_sizes[i] / size, align=align)
+        s = layout.split(factor=column_size / size, align=align)
         a = s.column(align=align)
         b = s.column(align=align)
         columns.append(a)
         layout = b
+        consumed += column_size
 
     return columns
 
@@ -198,8 +183,11 @@ def get_mouseovered_region(
     # available at: https://github.com/nutti/Screencast-Keys
     x, y = event.mouse_x, event.mouse_y
     for area in context.screen.areas:
+        # Regions are contained in their area, skip areas that aren't under the mouse
+        if not (area.x <= x < area.x + area.width and area.y <= y < area.y + area.height):
+            continue
         for region in area.regions:
-            if region.type == "":
+            if not region.type:
                 continue
             within_x = region.x <= x < region.x + region.width
             within_y = region.y <= y < region.y + region.height
@@ -209,38 +197,43 @@ def get_mouseovered_region(
     return None, None
 
 
+# Code taken and adjusted from ScreenCastKeys addon -> https://github.com/nutti/Screencast-Keys/
+SPACE_TYPE_CLASS_NAMES = (
+    ("SpaceView3D", 'VIEW_3D'),
+    ("SpaceClipEditor", 'CLIP_EDITOR'),
+    ("SpaceConsole", 'CONSOLE'),
+    ("SpaceDopeSheetEditor", 'DOPESHEET_EDITOR'),
+    ("SpaceFileBrowser", 'FILE_BROWSER'),
+    ("SpaceGraphEditor", 'GRAPH_EDITOR'),
+    ("SpaceImageEditor", 'IMAGE_EDITOR'),
+    ("SpaceInfo", 'INFO'),
+    ("SpaceLogicEditor", 'LOGIC_EDITOR'),
+    ("SpaceNLA", 'NLA_EDITOR'),
+    ("SpaceNodeEditor", 'NODE_EDITOR'),
+    ("SpaceOutliner", 'OUTLINER'),
+    ("SpacePreferences", 'PREFERENCES'),
+    ("SpaceUserPreferences", 'PREFERENCES'),
+    ("SpaceProperties", 'PROPERTIES'),
+    ("SpaceSequenceEditor", 'SEQUENCE_EDITOR'),
+    ("SpaceSpreadsheet", 'SPREADSHEET'),
+    ("SpaceTextEditor", 'TEXT_EDITOR'),
+    ("SpaceTimeline", 'TIMELINE'),
+)
+
+
+@functools.lru_cache(maxsize=1)
 def get_all_space_types() -> typing.Dict[str, bpy.types.Space]:
-    """Returns mapping of space type to its class - 'VIEW_3D -> bpy.types.SpaceView3D"""
+    """Returns mapping of space type to its class - 'VIEW_3D -> bpy.types.SpaceView3D
 
-    # Code taken and adjusted from ScreenCastKeys addon -> https://github.com/nutti/Screencast-Keys/
-    def add_if_exist(
-        cls_name: str, space_name: str, space_types: typing.Dict[str, bpy.types.Space]
-    ) -> None:
+    The available space types don't change while Blender is running, so the result is cached.
+    Don't modify the returned dictionary.
+    """
+    space_types = {}
+    for cls_name, space_name in SPACE_TYPE_CLASS_NAMES:
         cls = getattr(sys.modules["bpy.types"], cls_name, None)
         if cls is not None:
             space_types[space_name] = cls
 
-    space_types = {}
-    add_if_exist("SpaceView3D", 'VIEW_3D', space_types)
-    add_if_exist("SpaceClipEditor", 'CLIP_EDITOR', space_types)
-    add_if_exist("SpaceConsole", 'CONSOLE', space_types)
-    add_if_exist("SpaceDopeSheetEditor", 'DOPESHEET_EDITOR', space_types)
-    add_if_exist("SpaceFileBrowser", 'FILE_BROWSER', space_types)
-    add_if_exist("SpaceGraphEditor", 'GRAPH_EDITOR', space_types)
-    add_if_exist("SpaceImageEditor", 'IMAGE_EDITOR', space_types)
-    add_if_exist("SpaceInfo", 'INFO', space_types)
-    add_if_exist("SpaceLogicEditor", 'LOGIC_EDITOR', space_types)
-    add_if_exist("SpaceNLA", 'NLA_EDITOR', space_types)
-    add_if_exist("SpaceNodeEditor", 'NODE_EDITOR', space_types)
-    add_if_exist("SpaceOutliner", 'OUTLINER', space_types)
-    add_if_exist("SpacePreferences", 'PREFERENCES', space_types)
-    add_if_exist("SpaceUserPreferences", 'PREFERENCES', space_types)
-    add_if_exist("SpaceProperties", 'PROPERTIES', space_types)
-    add_if_exist("SpaceSequenceEditor", 'SEQUENCE_EDITOR', space_types)
-    add_if_exist("SpaceSpreadsheet", 'SPREADSHEET', space_types)
-    add_if_exist("SpaceTextEditor", 'TEXT_EDITOR', space_types)
-    add_if_exist("SpaceTimeline", 'TIMELINE', space_types)
-
     return space_types
 
 
@@ -9,12 +9,13 @@ import pathlib
 import typing
 import datetime
 import functools
+import collections
 import urllib.request
 import urllib.error
 import ssl
 import json
 import subprocess
-import math
+import threading
 import time
 import re
 import logging
@@ -25,6 +26,62 @@ logger = logging.getLogger(f"polygoniq.{__name__}")
 POLYGONIQ_DOCS_URL = "https://docs.polygoniq.com"
 POLYGONIQ_GITHUB_REPO_API_URL = "https://api.github.com/repos/polygoniq"
 
+# The platform doesn't change while running, evaluate the checks only once
+_IS_WINDOWS = sys.platform == "win32"
+_IS_MAC = sys.platform == "darwin"
+_IS_LINUX = sys.platform.startswith("linux")
+# Duplicate suffix Blender adds to names of datablocks - .001 - .999
+DUPLICATE_SUFFIX_PATTERN = re.compile(r"\.[0-9]{3}")
+
+
+def _filter_existing_paths(paths: typing.Iterable[str]) -> typing.List[str]:
+    """Returns paths from 'paths' that may exist in the filesystem, keeps the original order
+
+    Paths pointing to the same location are returned only once, so the caller doesn't check them
+    repeatedly. On Windows, where probing each path separately is slow, a parent directory shared
+    by multiple paths is listed only once and paths missing from it are dropped. Paths with
+    a parent of their own are kept for the caller to probe, listing a directory like 'C:/' costs
+    more than a single probe. Paths whose parent doesn't exist are dropped, paths whose parent
+    can't be listed for other reasons are kept for the caller to check.
+    """
+    unique_paths: typing.List[str] = []
+    seen_paths: typing.Set[str] = set()
+    for path in paths:
+        normalized_path = os.path.normcase(os.path.normpath(path))
+        if normalized_path in seen_paths:
+            continue
+        seen_paths.add(normalized_path)
+        unique_paths.append(path)
+
+    if not _IS_WINDOWS:
+        return unique_paths
+
+    parent_path_counts = collections.Counter(
+        os.path.dirname(os.path.normpath(path)) for path in unique_paths
+    )
+    parent_entries: typing.Dict[str, typing.Optional[typing.Set[str]]] = {}
+    ret = []
+    for path in unique_paths:
+        parent, basename = os.path.split(os.path.normpath(path))
+        if parent_path_counts[parent] == 1:
+            ret.append(path)
+            continue
+
+        if parent not in parent_entries:
+            try:
+                parent_entries[parent] = {os.path.normcase(entry) for entry in os.listdir(parent)}
+            except (FileNotFoundError, NotADirectoryError):
+                parent_entries[parent] = set()
+            except OSError:
+                # e.g. permission errors, the path itself may still be accessible
+                parent_entries[parent] = None
+
+        entries = parent_entries[parent]
+        if entries is None or os.path.normcase(basename) in entries:
+            ret.append(path)
+
+    return ret
+
 
 def autodetect_install_path(
     product: str, init_path: str, install_path_checker: typing.Callable[[str], bool]
@@ -35,11 +92,17 @@ def autodetect_install_path(
             os.path.join("~", "polygoniq", "blender_addons", product)
         )
         try:
+            # Only development machines have the product sources, don't resolve symlinks of
+            # 'init_path' (readlink of each path component) for everybody else.
+            init_abs_path = None
+            if os.path.isdir(vscode_product_path):
+                init_abs_path = os.path.abspath(init_path)
+                if os.path.commonpath([init_abs_path, vscode_product_path]) != vscode_product_path:
+                    # blender_vscode symlinks the addon sources into Blender addons directory
+                    init_abs_path = os.path.abspath(os.path.realpath(init_path))
             if (
-                os.path.commonpath(
-                    [os.path.abspath(os.path.realpath(init_path)), vscode_product_path]
-                )
-                == vscode_product_path
+                init_abs_path is not None
+                and os.path.commonpath([init_abs_path, vscode_product_path]) == vscode_product_path
             ):
                 staging_path_base = os.path.expanduser(
                     os.path.join("~", "polygoniq", "bazel-bin", "blender_addons", product)
@@ -68,7 +131,7 @@ def autodetect_install_path(
         print(f"{product} install dir autodetected as {big_zip_path} (big zip embedded)")
         return big_zip_path
 
-    if sys.platform == "win32":
+    if _IS_WINDOWS:
         SHOTS_IN_THE_DARK = [
             f"C:/{product}",
             f"D:/{product}",
@@ -76,12 +139,13 @@ def autodetect_install_path(
             f"D:/polygoniq/{product}",
         ]
 
-        for shot in SHOTS_IN_THE_DARK:
+        # Only existing paths can be install paths, filter them before using the checker
+        for shot in _filter_existing_paths(SHOTS_IN_THE_DARK):
             if install_path_checker(shot):
                 print(f"{product} install dir autodetected as {shot}")
                 return os.path.abspath(shot)
 
-    elif sys.platform in ["linux", "darwin"]:
+    elif _IS_LINUX or _IS_MAC:
         SHOTS_IN_THE_DARK = [
             os.path.expanduser(f"~/{product}"),
             os.path.expanduser(f"~/Desktop/{product}"),
@@ -96,7 +160,8 @@ def autodetect_install_path(
             f"/opt/{product}",
         ]
 
-        for shot in SHOTS_IN_THE_DARK:
+        # Probing paths is cheap here, only skip the duplicate ones before using the checker
+        for shot in _filter_existing_paths(SHOTS_IN_THE_DARK):
             if install_path_checker(shot):
                 print(f"{product} install dir autodetected as {shot}")
                 return os.path.abspath(shot)
@@ -119,40 +184,74 @@ def absolutize_preferences_path(
 
 
 def contains_object_duplicate_suffix(name: str) -> bool:
-    pattern = re.compile(r"^\.[0-9]{3}$")
-    return bool(pattern.match(name[-4:]))
+    return DUPLICATE_SUFFIX_PATTERN.fullmatch(name, len(name) - 4) is not None
 
 
 def remove_object_duplicate_suffix(name: str) -> str:
-    splitted_name = name.rsplit(".", 1)
-    if len(splitted_name) == 1:
-        return splitted_name[0]
+    # Most names have no suffix at all, return them without splitting
+    if "." not in name:
+        return name
 
+    splitted_name = name.rsplit(".", 1)
     if splitted_name[1].isnumeric():
         return splitted_name[0]
 
     return name
 
 
-def generate_unique_name(old_name: str, container: typing.Iterable[typing.Any]) -> str:
+def generate_unique_name(
+    old_name: str,
+    container: typing.Iterable[typing.Any],
+    existing_names: typing.Optional[typing.Set[str]] = None,
+) -> str:
+    """Returns 'old_name' without duplicate suffix, or with the lowest free suffix if it's taken
+
+    'container' can be anything supporting 'in' with names, e.g. a bpy_prop_collection. Callers
+    generating many names from the same container can pass a precomputed set of its names as
+    'existing_names', taken suffixes are then gathered in one pass over the set.
+    """
     # TODO: Unify this with renderset unique naming generation
     name_without_suffix = remove_object_duplicate_suffix(old_name)
+    if existing_names is None:
+        i = 1
+        new_name = name_without_suffix
+        while new_name in container:
+            new_name = f"{name_without_suffix}.{i:03d}"
+            i += 1
+
+        return new_name
+
+    if name_without_suffix not in existing_names:
+        return name_without_suffix
+
+    suffix_pattern = re.compile(rf"{re.escape(name_without_suffix)}\.([0-9]{{3,}})")
+    taken_indices = set()
+    for name in existing_names:
+        match = suffix_pattern.fullmatch(name)
+        if match is None:
+            continue
+        index = int(match.group(1))
+        # Only suffixes that we would generate ourselves, "name.0001" doesn't block "name.001"
+        if match.group(1) == f"{index:03d}":
+            taken_indices.add(index)
+
     i = 1
-    new_name = name_without_suffix
-    while new_name in container:
-        new_name = f"{name_without_suffix}.{i:03d}"
+    while i in taken_indices:
         i += 1
 
-    return new_name
+    return f"{name_without_suffix}.{i:03d}"
+
+
+SIZE_UNIT_NAMES = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
 
 
 def convert_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
-    size_name = ("B", "KB", "MB", "GB", "TB", "PB", "EB", "ZB", "YB")
-    index = int(math.floor(math.log(size_bytes, 1024)))
-    size = round(size_bytes / math.pow(1024, index), 2)
-    return f"{size} {size_name[index]}"
+    # 1024 is 2^10, so the unit index is the number of whole 10 bit groups of the size
+    index = min((size_bytes.bit_length() - 1) // 10, len(SIZE_UNIT_NAMES) - 1)
+    size = round(size_bytes / (1 << (index * 10)), 2)
+    return f"{size} {SIZE_UNIT_NAMES[index]}"
 
 
 def blender_cursor(cursor_name: str = 'WAIT'):
@@ -168,6 +267,7 @@ def blender_cursor(cursor_name: str = 'WAIT'):
     """
 
     def cursor_decorator(fn):
+        @functools.wraps(fn)
         def wrapper(self, context: bpy.types.Context, *args, **kwargs):
             context.window.cursor_modal_set(cursor_name)
             try:
@@ -181,40 +281,89 @@ def blender_cursor(cursor_name: str = 'WAIT'):
 
 
 def timeit(fn):
+    @functools.wraps(fn)
     def timed(*args, **kw):
-        ts = time.time()
+        ts = time.perf_counter()
         result = fn(*args, **kw)
-        te = time.time()
+        te = time.perf_counter()
         print(f"{fn.__name__!r}  {(te - ts) * 1000:2.2f} ms")
         return result
 
     return timed
 
 
-def timed_cache(**timedelta_kwargs):
+# Separates positional and keyword arguments in 'timed_cache' keys
+_KWARGS_MARK = object()
+
+
+TimedCacheInfo = collections.namedtuple("TimedCacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def timed_cache(maxsize: typing.Optional[int] = None, **timedelta_kwargs):
+    """Decorator caching results of the decorated function for time given by 'timedelta_kwargs'
+
+    Each result expires separately after the given time from its evaluation, expired results are
+    purged at most once per that time. If 'maxsize' is set, least recently used results are evicted
+    when the cache grows over it. The decorated function provides 'cache_clear' and 'cache_info'
+    similarly to 'functools.lru_cache'.
+    """
+
     def _wrapper(f):
-        update_delta = datetime.timedelta(**timedelta_kwargs)
-        next_update = datetime.datetime.utcnow() + update_delta
-        f = functools.lru_cache(None)(f)
+        ttl = datetime.timedelta(**timedelta_kwargs).total_seconds()
+        # key -> (value, expiry time in time.monotonic() seconds)
+        cache: collections.OrderedDict[typing.Hashable, typing.Tuple[typing.Any, float]] = (
+            collections.OrderedDict()
+        )
+        lock = threading.Lock()
+        hits = misses = 0
+        next_purge = time.monotonic() + ttl
 
         @functools.wraps(f)
         def _wrapped(*args, **kwargs):
-            nonlocal next_update
-            now = datetime.datetime.utcnow()
-            if now >= next_update:
-                f.cache_clear()
-                next_update = now + update_delta
-            return f(*args, **kwargs)
-
+            nonlocal hits, misses, next_purge
+            key = args + ((_KWARGS_MARK,) + tuple(kwargs.items()) if kwargs else ())
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key, None)
+                if entry is not None and entry[1] > now:
+                    hits += 1
+                    cache.move_to_end(key)
+                    return entry[0]
+                misses += 1
+
+            value = f(*args, **kwargs)
+            with lock:
+                cache[key] = (value, now + ttl)
+                cache.move_to_end(key)
+                if now >= next_purge:
+                    # Results of calls that are never repeated would stay in the cache forever
+                    for expired_key in [k for k, (_, expiry) in cache.items() if expiry <= now]:
+                        del cache[expired_key]
+                    next_purge = now + ttl
+                if maxsize is not None and len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+
+        def cache_clear() -> None:
+            nonlocal hits, misses
+            with lock:
+                cache.clear()
+                hits = misses = 0
+
+        def cache_info() -> TimedCacheInfo:
+            return TimedCacheInfo(hits, misses, maxsize, len(cache))
+
+        _wrapped.cache_clear = cache_clear
+        _wrapped.cache_info = cache_info
         return _wrapped
 
     return _wrapper
 
 
 def xdg_open_file(path):
-    if sys.platform == "win32":
+    if _IS_WINDOWS:
         os.startfile(path)
-    elif sys.platform == "darwin":
+    elif _IS_MAC:
         subprocess.call(["open", path])
     else:
         subprocess.call(["xdg-open", path])
@@ -231,7 +380,7 @@ def fork_running_blender(blend_path: typing.Optional[str] = None) -> None:
     if blend_path is not None:
         args += [blend_path]
 
-    if sys.platform in ["win32", "cygwin"]:
+    if _IS_WINDOWS or sys.platform == "cygwin":
         # Detach child process and close its stdin/stdout/stderr, so it can keep running
         # after parent Blender is closed.
         # https://stackoverflow.com/questions/52449997/how-to-detach-python-child-process-on-windows-without-setsid
@@ -240,7 +389,7 @@ def fork_running_blender(blend_path: typing.Optional[str] = None) -> None:
         flags |= subprocess.CREATE_NEW_PROCESS_GROUP
         flags |= subprocess.CREATE_NO_WINDOW
         subprocess.Popen(args, close_fds=True, creationflags=flags)
-    elif sys.platform in ["darwin", "linux", "linux2"]:  # POSIX systems
+    elif _IS_MAC or _IS_LINUX:  # POSIX systems
         subprocess.Popen(args, start_new_session=True)
     else:
         raise RuntimeError(f"Unsupported OS: sys.platform={sys.platform}")
@@ -251,18 +400,33 @@ def run_logging_subprocess(
 ) -> int:
     """Runs `subprocess_args` as subprocess and logs stdout and stderr of the subprocess.
 
-    If 'logger_' is None, logger from polib will be used.
+    If 'logger_' is None, logger from polib will be used. If the logger doesn't log INFO
+    messages, the output of the subprocess is discarded without being read.
 
     Returns returncode from the subprocess, 0 means that no errors ocurred.
     """
     if logger_ is None:
         logger_ = logger
 
-    process = subprocess.Popen(subprocess_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    if not logger_.isEnabledFor(logging.INFO):
+        return subprocess.call(
+            subprocess_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    # Let the pipe decode the output as text, so we don't have to decode each line ourselves
+    process = subprocess.Popen(
+        subprocess_args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        encoding="utf-8",
+        errors="replace",
+    )
 
     # Read from indexing process till it's running
     for line in process.stdout:
-        logger_.info(line.decode())
+        logger_.info(line.rstrip("\n"))
     process.wait()
     return process.returncode
 
@@ -324,6 +488,11 @@ def isfile_case_sensitive(path: str) -> bool:
 
 
 def get_bpy_filepath_relative_to_dir(input_dir: str, filepath: str, library=None) -> str:
+    # Absolute paths don't need to be resolved against the blend or library file, in that case
+    # bpy.path.abspath and bpy.path.relpath would end up in os.path.relpath anyway.
+    if library is None and not filepath.startswith("//") and os.path.isabs(filepath):
+        return normalize_path(os.path.relpath(filepath, start=input_dir))
+
     file_abspath = bpy.path.abspath(filepath, library=library)
     rel_path = bpy.path.relpath(file_abspath, start=input_dir)
     return normalize_path(rel_path.removeprefix("//"))
@@ -336,10 +505,18 @@ def get_first_existing_ancestor_directory(
         whitelist = set()
     if file_path not in whitelist and not os.path.exists(file_path):
         return None
-    current_dir = pathlib.Path(os.path.dirname(file_path)).resolve()
-    while not os.path.exists(current_dir):
-        current_dir = current_dir.parent.resolve()
-    return str(current_dir)
+    current_dir = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        # We stat each ancestor only once. Unlike os.path.exists, os.stat doesn't hide other
+        # errors than the path not existing, e.g. permission errors.
+        try:
+            os.stat(current_dir)
+            return current_dir
+        except (FileNotFoundError, NotADirectoryError):
+            parent_dir = os.path.dirname(current_dir)
+            if parent_dir == current_dir:
+                return None
+            current_dir = parent_dir
 
 
 def get_all_datablocks(data: bpy.types.BlendData) -> typing.List[typing.Tuple[bpy.types.ID, str]]: